@@ -0,0 +1,89 @@
+"""
+Measures the memory saved by the categorical schema on large batches.
+
+Compares the engineered frame TitanicPreprocessor now produces with the same
+frame held as object strings, as the pipeline did before. Pass --baseline to
+also time transform of an older preprocessor.py on the same rows and
+artifacts. Run from src/api:
+    git show <rev>:src/api/preprocessor.py > /tmp/baseline_preprocessor.py
+    python bench_schema.py --rows 1000000 --baseline /tmp/baseline_preprocessor.py
+"""
+
+import argparse
+import importlib.util
+import logging
+import tempfile
+import time
+
+from preprocessor import TitanicPreprocessor
+from synthetic import build_stand_in_artifacts, synthetic_passengers
+
+CATEGORICAL_FEATURES = ["sex", "embarked", "cabin", "title", "family_size"]
+
+
+def _megabytes(df) -> float:
+    return df.memory_usage(deep=True).sum() / 1024**2
+
+
+def _load_preprocessor_class(path: str):
+    spec = importlib.util.spec_from_file_location("baseline_preprocessor", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.TitanicPreprocessor
+
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--models-dir", help="Artifacts to use; stand-ins if unset")
+    parser.add_argument("--baseline", help="An older preprocessor.py to time too")
+    args = parser.parse_args()
+
+    # The preprocessor logs at DEBUG, which would swamp the timings.
+    logging.getLogger().setLevel(logging.WARNING)
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as stand_in_dir:
+        models_dir = args.models_dir
+        if models_dir is None:
+            build_stand_in_artifacts(stand_in_dir)
+            models_dir = stand_in_dir
+        preprocessor = TitanicPreprocessor(models_path=models_dir)
+        if args.baseline:
+            baseline = _load_preprocessor_class(args.baseline)(models_path=models_dir)
+
+    raw = synthetic_passengers(args.rows)
+    engineered, engineer_seconds = _timed(preprocessor.engineer_features, raw)
+    _, transform_seconds = _timed(preprocessor.transform, raw)
+
+    as_strings = engineered.astype(
+        {feature: object for feature in CATEGORICAL_FEATURES if feature != "sex"}
+    ).astype({"sex": "int64"})
+
+    before, after = _megabytes(as_strings), _megabytes(engineered)
+    print(f"rows:                     {args.rows:,}")
+    print(f"raw input:                {_megabytes(raw):10.1f} MB")
+    print(f"engineered, object dtype: {before:10.1f} MB")
+    print(f"engineered, categorical:  {after:10.1f} MB")
+    print(f"reduction:                {before / after:10.1f}x")
+    print(f"engineer_features:        {engineer_seconds:10.2f} s")
+    print(f"transform:                {transform_seconds:10.2f} s")
+    if baseline is not None:
+        _, baseline_seconds = _timed(baseline.transform, raw)
+        print(f"baseline transform:       {baseline_seconds:10.2f} s")
+        print(
+            f"speed-up:                 {baseline_seconds / transform_seconds:10.1f}x"
+        )
+    for feature in CATEGORICAL_FEATURES:
+        column = engineered[feature]
+        print(
+            f"  {feature:<12} {str(column.dtype):<10} "
+            f"{column.memory_usage(deep=True) / 1024**2:8.1f} MB vs "
+            f"{as_strings[feature].memory_usage(deep=True) / 1024**2:8.1f} MB"
+        )
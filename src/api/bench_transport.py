@@ -0,0 +1,104 @@
+"""
+Compares the JSON /predict endpoint against the binary msgpack transport.
+
+Start both servers first (from src/api):
+    uvicorn main:app --port 8000
+    python binary_server.py --port 8001
+then run:
+    python bench_transport.py -n 2000 --batch-size 512
+"""
+
+import argparse
+import time
+
+import numpy as np
+import requests
+
+from binary_protocol import BinaryPredictionClient
+
+SAMPLE_PASSENGER = {
+    "pclass": 3,
+    "sex": "male",
+    "age": 22.0,
+    "sibsp": 1,
+    "parch": 0,
+    "fare": 7.25,
+    "embarked": "S",
+    "name": "Braund, Mr. Owen Harris",
+    "ticket": "A/5 21171",
+    "cabin": None,
+}
+
+
+def _summarize(name: str, latencies: list[float], rows: int) -> dict:
+    latencies_ms = np.array(latencies) * 1000
+    total = sum(latencies)
+    return {
+        "transport": name,
+        "calls": len(latencies),
+        "p50_ms": np.percentile(latencies_ms, 50),
+        "p95_ms": np.percentile(latencies_ms, 95),
+        "rows_per_s": rows / total if total else float("nan"),
+    }
+
+
+def bench_json(url: str, n: int) -> dict:
+    latencies = []
+    with requests.Session() as session:
+        for _ in range(n):
+            start = time.perf_counter()
+            response = session.post(url, json=SAMPLE_PASSENGER, timeout=10)
+            response.raise_for_status()
+            response.json()
+            latencies.append(time.perf_counter() - start)
+    return _summarize("json /predict", latencies, n)
+
+
+def bench_binary_unary(client: BinaryPredictionClient, n: int) -> dict:
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        client.predict(SAMPLE_PASSENGER)
+        latencies.append(time.perf_counter() - start)
+    return _summarize("binary predict", latencies, n)
+
+
+def bench_binary_batch(
+    client: BinaryPredictionClient, n: int, batch_size: int, stream: bool
+) -> dict:
+    batch = [SAMPLE_PASSENGER] * batch_size
+    latencies = []
+    for _ in range(max(1, n // batch_size)):
+        start = time.perf_counter()
+        if stream:
+            for _ in client.predict_stream(batch, chunk_size=batch_size // 4 or 1):
+                pass
+        else:
+            client.predict_batch(batch)
+        latencies.append(time.perf_counter() - start)
+    name = "binary predict_stream" if stream else "binary predict_batch"
+    return _summarize(name, latencies, len(latencies) * batch_size)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--json-url", default="http://127.0.0.1:8000/predict")
+    parser.add_argument("--binary-host", default="127.0.0.1")
+    parser.add_argument("--binary-port", type=int, default=8001)
+    parser.add_argument("-n", type=int, default=1000, help="Passengers per run")
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    results = [bench_json(args.json_url, args.n)]
+    with BinaryPredictionClient(args.binary_host, args.binary_port) as client:
+        client.predict(SAMPLE_PASSENGER)  # warm-up
+        results.append(bench_binary_unary(client, args.n))
+        results.append(bench_binary_batch(client, args.n, args.batch_size, False))
+        results.append(bench_binary_batch(client, args.n, args.batch_size, True))
+
+    for result in results:
+        print(
+            f"{result['transport']:<24} calls={result['calls']:<6} "
+            f"p50={result['p50_ms']:8.3f}ms p95={result['p95_ms']:8.3f}ms "
+            f"rows/s={result['rows_per_s']:10.1f}"
+        )
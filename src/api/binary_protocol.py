@@ -0,0 +1,109 @@
+import socket
+import struct
+
+import msgpack
+
+# Every frame is a 4-byte big-endian length followed by a msgpack body.
+HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+
+def pack_frame(message: dict) -> bytes:
+    """
+    Encodes a message as a length-prefixed msgpack frame.
+    """
+    body = msgpack.packb(message, use_bin_type=True)
+    if len(body) > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {len(body)} bytes exceeds {MAX_FRAME_SIZE}")
+    return HEADER.pack(len(body)) + body
+
+
+def unpack_body(body: bytes) -> dict:
+    return msgpack.unpackb(body, raw=False)
+
+
+async def read_frame(reader) -> dict:
+    """
+    Reads a single frame from an asyncio stream reader.
+    Raises asyncio.IncompleteReadError when the peer closes the connection.
+    """
+    header = await reader.readexactly(HEADER.size)
+    (size,) = HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {size} bytes exceeds {MAX_FRAME_SIZE}")
+    return unpack_body(await reader.readexactly(size))
+
+
+class BinaryPredictionClient:
+    """
+    A blocking client for the msgpack prediction server.
+    Keeps one TCP connection open so repeated calls skip the handshake.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8001, timeout=10.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def predict(self, passenger: dict) -> dict:
+        """
+        Predicts survival for a single passenger.
+        """
+        return self._call({"op": "predict", "passenger": passenger})["result"]
+
+    def predict_batch(self, passengers: list[dict]) -> list[dict]:
+        """
+        Predicts survival for many passengers in one model call.
+        """
+        return self._call({"op": "predict_batch", "passengers": passengers})[
+            "results"
+        ]
+
+    def predict_stream(self, passengers: list[dict], chunk_size: int = 1024):
+        """
+        Sends a large batch and yields results chunk by chunk as the server
+        scores them, so callers can start consuming before the batch finishes.
+        """
+        self._send(
+            {"op": "predict_stream", "passengers": passengers, "chunk_size": chunk_size}
+        )
+        while True:
+            response = self._check(self._recv())
+            if response.get("done"):
+                return
+            yield from response["results"]
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _call(self, message: dict) -> dict:
+        self._send(message)
+        return self._check(self._recv())
+
+    def _send(self, message: dict):
+        self.sock.sendall(pack_frame(message))
+
+    def _recv(self) -> dict:
+        (size,) = HEADER.unpack(self._recv_exactly(HEADER.size))
+        if size > MAX_FRAME_SIZE:
+            raise ValueError(f"Frame of {size} bytes exceeds {MAX_FRAME_SIZE}")
+        return unpack_body(self._recv_exactly(size))
+
+    def _recv_exactly(self, size: int) -> bytes:
+        buffer = bytearray()
+        while len(buffer) < size:
+            chunk = self.sock.recv(size - len(buffer))
+            if not chunk:
+                raise ConnectionError("Connection closed by prediction server")
+            buffer.extend(chunk)
+        return bytes(buffer)
+
+    def _check(self, response: dict) -> dict:
+        if not response.get("ok"):
+            raise RuntimeError(f"Prediction server error: {response.get('error')}")
+        return response
@@ -0,0 +1,193 @@
+"""
+A compact binary transport for internal callers that want to skip JSON.
+
+Frames are length-prefixed msgpack (see binary_protocol.py). Requests carry an
+"op" of "predict", "predict_batch" or "predict_stream", and are scored with the
+same preprocessor and model as the FastAPI app.
+
+Run from src/api:
+    python binary_server.py --host 127.0.0.1 --port 8001
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Optional
+
+import pandas as pd
+from pandas.api.types import infer_dtype, is_bool_dtype, is_numeric_dtype
+
+from binary_protocol import pack_frame, read_frame
+from main import Passenger, predict_frame
+
+logger = logging.getLogger(__name__)
+
+PASSENGER_COLUMNS = list(Passenger.model_fields)
+REQUIRED_FIELDS = [
+    name for name, field in Passenger.model_fields.items() if field.is_required()
+]
+PASSENGER_DEFAULTS = {
+    name: field.default
+    for name, field in Passenger.model_fields.items()
+    if not field.is_required()
+}
+
+
+def build_frame(passengers: list[dict]) -> pd.DataFrame:
+    """
+    Builds the raw input frame without going through pydantic, then checks
+    it column by column against the same domain as the Passenger model.
+    """
+    if not isinstance(passengers, list) or not all(
+        isinstance(passenger, dict) for passenger in passengers
+    ):
+        raise ValueError("passengers must be a list of maps")
+    for i, passenger in enumerate(passengers):
+        missing = [name for name in REQUIRED_FIELDS if name not in passenger]
+        if missing:
+            raise ValueError(f"Passenger {i} is missing fields: {missing}")
+    records = [{**PASSENGER_DEFAULTS, **passenger} for passenger in passengers]
+    df = pd.DataFrame.from_records(records, columns=PASSENGER_COLUMNS)
+    return validate_frame(df)
+
+
+def _numeric(values: pd.Series) -> Optional[pd.Series]:
+    if is_numeric_dtype(values) and not is_bool_dtype(values):
+        return values.astype(float)
+    # An all-None column comes through as object; the range checks decide
+    # whether missing values are allowed.
+    if values.isna().all():
+        return values.astype(float)
+    return None
+
+
+def validate_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorised version of the Passenger field constraints. Raises ValueError
+    listing every failing field, like a 422 from the JSON API.
+    """
+    numeric = {
+        column: _numeric(df[column])
+        for column in ["pclass", "age", "sibsp", "parch", "fare"]
+    }
+    errors = [
+        f"{column} must be numeric"
+        for column, values in numeric.items()
+        if values is None
+    ]
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    checks = {
+        "pclass": numeric["pclass"].isin([1, 2, 3]),
+        "age": numeric["age"].isna() | numeric["age"].between(0, 90),
+        "sibsp": (numeric["sibsp"] >= 0) & (numeric["sibsp"] % 1 == 0),
+        "parch": (numeric["parch"] >= 0) & (numeric["parch"] % 1 == 0),
+        "fare": numeric["fare"] >= 0,
+        "sex": df["sex"].isin(["male", "female"]),
+        "embarked": df["embarked"].isna() | df["embarked"].isin(["S", "C", "Q"]),
+    }
+    for column, valid in checks.items():
+        if not valid.all():
+            row = int(valid.to_numpy().argmin())
+            errors.append(f"{column} is invalid for passenger {row}")
+    for column, optional in [("name", False), ("ticket", False), ("cabin", True)]:
+        values = df[column].dropna() if optional else df[column]
+        if infer_dtype(values, skipna=False) not in ("string", "empty"):
+            errors.append(f"{column} must be a string")
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    df = df.copy()
+    for column in ["pclass", "sibsp", "parch"]:
+        df[column] = numeric[column].astype(int)
+    df["age"] = numeric["age"]
+    df["fare"] = numeric["fare"]
+    return df
+
+
+async def _score(passengers: list[dict]) -> list[dict]:
+    if isinstance(passengers, list) and not passengers:
+        return []
+    return await asyncio.to_thread(predict_frame, build_frame(passengers))
+
+
+async def dispatch(request: dict):
+    """
+    Yields one or more response messages for a single request frame.
+    """
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a map with an 'op' key")
+    op = request.get("op")
+    if op == "predict":
+        results = await _score([request["passenger"]])
+        yield {"ok": True, "result": results[0]}
+    elif op == "predict_batch":
+        yield {"ok": True, "results": await _score(request["passengers"])}
+    elif op == "predict_stream":
+        passengers = request["passengers"]
+        chunk_size = int(request.get("chunk_size", 1024))
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        # Validate the whole batch up front, so bad input is rejected with
+        # batch-wide row numbers before any chunk has been sent.
+        frame = build_frame(passengers)
+        for start in range(0, len(frame), chunk_size):
+            chunk = frame.iloc[start : start + chunk_size]
+            yield {"ok": True, "results": await asyncio.to_thread(predict_frame, chunk)}
+        yield {"ok": True, "done": True}
+    else:
+        raise ValueError(f"Unknown op: {op!r}")
+
+
+async def _send(writer, message: dict):
+    writer.write(pack_frame(message))
+    await writer.drain()
+
+
+async def handle_connection(reader, writer):
+    try:
+        while True:
+            try:
+                request = await read_frame(reader)
+            except asyncio.IncompleteReadError:
+                break
+            except Exception as e:
+                # After a bad header or body the stream cannot be resynchronised,
+                # so report the error and close the connection.
+                logger.warning(f"Malformed binary frame: {e!r}")
+                await _send(writer, {"ok": False, "error": f"Malformed frame: {e!r}"})
+                break
+            try:
+                async for response in dispatch(request):
+                    await _send(writer, response)
+            except (KeyError, ValueError) as e:
+                logger.warning(f"Rejected binary request: {e!r}")
+                error = f"Missing field: {e}" if isinstance(e, KeyError) else str(e)
+                await _send(writer, {"ok": False, "error": error})
+            except Exception as e:
+                logger.exception("Binary prediction failed")
+                await _send(writer, {"ok": False, "error": str(e)})
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def serve(host: str, port: int):
+    server = await asyncio.start_server(handle_connection, host, port)
+    logger.info(f"Binary prediction server listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port))
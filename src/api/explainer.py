@@ -0,0 +1,181 @@
+"""
+SHAP explanations for the deployed model.
+
+Linear models need a background sample of raw training passengers. Export it
+once next to the other artifacts (from src/api):
+    python explainer.py ../../input/titanic.csv [models_dir]
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+import shap
+
+
+class SurvivalExplainer:
+    """
+    Computes SHAP attributions for the deployed model and folds the one-hot
+    columns back into the engineered features (title, has_cabin, ...).
+    Results are cached per passenger together with the prediction.
+    """
+
+    def __init__(
+        self,
+        model,
+        preprocessor,
+        predict_fn,
+        background: Optional[pd.DataFrame] = None,
+        cache_size: int = 4096,
+    ):
+        """
+        :param model: The fitted model, optionally wrapping an estimator in `.model`.
+        :param preprocessor: The TitanicPreprocessor used for inference.
+        :param predict_fn: Turns a processed frame into prediction dicts.
+        :param background: Raw training passengers, required for linear models.
+        :param cache_size: Number of passengers whose explanations are kept.
+        """
+        self.preprocessor = preprocessor
+        self.predict_fn = predict_fn
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        estimator = getattr(model, "model", model)
+        if hasattr(estimator, "coef_"):
+            if background is None:
+                raise ValueError("Linear models need background data to explain")
+            processed_background = preprocessor.transform(background)
+            self.explainer = shap.LinearExplainer(estimator, processed_background)
+            self.kind = "linear"
+            self.output = "log_odds"
+        else:
+            # Path-dependent TreeSHAP uses the trees' own cover statistics, so
+            # it needs no background and is the fastest exact tree explainer.
+            self.explainer = shap.TreeExplainer(
+                estimator, feature_perturbation="tree_path_dependent"
+            )
+            self.kind = "tree"
+            # Forest and single-tree classifiers explain probabilities, boosted
+            # ensembles explain log-odds.
+            tree_output = self.explainer.model.tree_output
+            self.output = (
+                tree_output if tree_output in ("probability", "log_odds") else "raw"
+            )
+        self.base_value = float(np.atleast_1d(self.explainer.expected_value)[-1])
+
+        sources = preprocessor.encoded_feature_sources()
+        self.features = list(dict.fromkeys(sources.values()))
+        # Summing attributions per engineered feature becomes one matmul.
+        self._grouping = np.zeros((len(sources), len(self.features)))
+        for row, source in enumerate(sources.values()):
+            self._grouping[row, self.features.index(source)] = 1.0
+
+    def explain(self, records: list[dict]) -> list[dict]:
+        """
+        Returns the prediction and per-feature attributions for each record.
+        Only passengers missing from the cache are scored, in a single batch.
+        """
+        keys = [tuple(record.values()) for record in records]
+        with self._lock:
+            cached = {key: self._cache[key] for key in keys if key in self._cache}
+            for key in cached:
+                self._cache.move_to_end(key)
+
+        missing = list(dict.fromkeys(key for key in keys if key not in cached))
+        if missing:
+            records_by_key = dict(zip(keys, records))
+            input_df = pd.DataFrame([records_by_key[key] for key in missing])
+            fresh = dict(zip(missing, self._explain_frame(input_df)))
+            cached.update(fresh)
+            with self._lock:
+                self._cache.update(fresh)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return [cached[key] for key in keys]
+
+    def _explain_frame(self, input_df: pd.DataFrame) -> list[dict]:
+        processed_df = self.preprocessor.transform(input_df)
+        predictions = self.predict_fn(processed_df)
+
+        values = self.explainer.shap_values(processed_df)
+        if isinstance(values, list):
+            values = values[-1]
+        values = np.asarray(values)
+        if values.ndim == 3:
+            values = values[:, :, -1]
+        grouped = values @ self._grouping
+
+        return [
+            {
+                **prediction,
+                "explainer": self.kind,
+                "output": self.output,
+                "base_value": self.base_value,
+                "attributions": dict(zip(self.features, map(float, row))),
+            }
+            for prediction, row in zip(predictions, grouped)
+        ]
+
+
+BACKGROUND_COLUMNS = [
+    "pclass",
+    "sex",
+    "age",
+    "sibsp",
+    "parch",
+    "fare",
+    "embarked",
+    "name",
+    "ticket",
+    "cabin",
+]
+
+
+def export_background(
+    training_passengers: pd.DataFrame, models_path: str, size: int = 100, seed=29
+) -> str:
+    """
+    Samples raw training passengers into models/shap_background.joblib, which
+    the API loads once at startup for linear explanations.
+
+    :param training_passengers: Raw training rows with the Passenger columns.
+    :param models_path: Directory holding the other model artifacts.
+    :param size: Number of passengers to keep.
+    :param seed: Seed for the sample.
+    :return: Path of the written file.
+    """
+    sample = training_passengers[BACKGROUND_COLUMNS].sample(
+        min(size, len(training_passengers)), random_state=seed
+    )
+    path = os.path.join(models_path, "shap_background.joblib")
+    joblib.dump(sample.reset_index(drop=True), path)
+    return path
+
+
+if __name__ == "__main__":
+    from sklearn.model_selection import train_test_split
+
+    if len(sys.argv) not in (2, 3):
+        sys.exit("usage: python explainer.py <titanic.csv> [models_dir]")
+    models_dir = (
+        sys.argv[2]
+        if len(sys.argv) > 2
+        else os.path.join(os.path.dirname(__file__), "..", "..", "models")
+    )
+    df = pd.read_csv(sys.argv[1])
+    # Same split as notebooks/full_dataset.ipynb, so only training rows are used.
+    X_train, _, _, _ = train_test_split(
+        df.drop(columns=["survived"]),
+        df["survived"],
+        test_size=0.2,
+        random_state=29,
+        stratify=df["survived"],
+    )
+    print(f"Background sample written to {export_background(X_train, models_dir)}")
@@ -0,0 +1,226 @@
+"""
+Compiles a fitted linear model and the one-hot layout of data_transformer
+into a weights table, so scoring is a lookup-and-sum per row instead of a
+transformer.transform plus predict_proba.
+
+Export from src/api:
+    python linear_export.py [models_dir]
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Rows that take the paths a random sample rarely does: missing age, fare,
+# port and cabin, titles and decks the encoder never saw, a name without a
+# title, an unknown port and a family too large for any family_size bin.
+# All of them should reach the scorer as code -1 or an imputed value.
+PARITY_PASSENGERS = [
+    {
+        "pclass": 1,
+        "sex": "female",
+        "age": 38.0,
+        "sibsp": 1,
+        "parch": 0,
+        "fare": 71.28,
+        "embarked": "C",
+        "name": "Cumings, Mrs. John Bradley",
+        "ticket": "PC 17599",
+        "cabin": "C85",
+    },
+    {
+        "pclass": 3,
+        "sex": "male",
+        "age": None,
+        "sibsp": 0,
+        "parch": 0,
+        "fare": None,
+        "embarked": None,
+        "name": "Moran, Mr. James",
+        "ticket": "330877",
+        "cabin": None,
+    },
+    {
+        "pclass": 2,
+        "sex": "male",
+        "age": 54.0,
+        "sibsp": 0,
+        "parch": 0,
+        "fare": 14.0,
+        "embarked": "S",
+        "name": "Smith, Prof. Adam",
+        "ticket": "not-a-ticket",
+        "cabin": "Z42",
+    },
+    {
+        "pclass": 3,
+        "sex": "female",
+        "age": 4.0,
+        "sibsp": 10,
+        "parch": 10,
+        "fare": 46.9,
+        "embarked": "X",
+        "name": "Goodwin Lillian Amy",
+        "ticket": "CA 2144",
+        "cabin": "",
+    },
+    {
+        "pclass": 1,
+        "sex": "male",
+        "age": None,
+        "sibsp": 0,
+        "parch": 2,
+        "fare": 0.0,
+        "embarked": "Q",
+        "name": "Laroche, Jonkheer. Joseph",
+        "ticket": "112058",
+        "cabin": "T",
+    },
+]
+
+
+def parity_sample(background: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Returns the fixed edge-case passengers, followed by the SHAP background
+    sample when one was exported, for LinearScorer.check_parity.
+    """
+    sample = pd.DataFrame(PARITY_PASSENGERS)
+    if background is not None:
+        sample = pd.concat([sample, background], ignore_index=True)
+    return sample
+
+
+class LinearScorer:
+    """
+    Scores engineered (pre one-hot) frames with a compiled weights table.
+    Unknown categories contribute nothing, as with handle_unknown="ignore".
+    """
+
+    def __init__(self, table: dict):
+        """
+        :param table: The exported weights, with keys "classes", "intercept",
+            "categorical" ({feature: {category: weight}}) and "numeric"
+            ({feature: weight}).
+        """
+        self.table = table
+        self.classes = np.asarray(table["classes"])
+        self.intercept = float(table["intercept"])
+        self.categorical = {
+            feature: (
+                pd.Index(list(weights)),
+                # A trailing zero so that code -1 (unknown or missing) adds nothing.
+                np.append(np.fromiter(weights.values(), dtype=float), 0.0),
+            )
+            for feature, weights in table["categorical"].items()
+        }
+        self.numeric_features = list(table["numeric"])
+        self.numeric_weights = np.fromiter(table["numeric"].values(), dtype=float)
+
+    @classmethod
+    def from_model(cls, model, preprocessor):
+        """
+        Builds the weights table from a fitted binary linear classifier.
+
+        :param model: A fitted model exposing coef_, or wrapping one in `.model`.
+        :param preprocessor: The TitanicPreprocessor whose transformer fed the model.
+        """
+        estimator = getattr(model, "model", model)
+        if not hasattr(estimator, "coef_") or estimator.coef_.shape[0] != 1:
+            raise ValueError("Only binary linear classifiers can be exported")
+
+        encoded = preprocessor.encoded_categories()
+        names = preprocessor.transformer.get_feature_names_out()
+        categorical, numeric = {}, {}
+        for name, weight in zip(names, estimator.coef_[0]):
+            if name in encoded:
+                feature, category = encoded[name]
+                categorical.setdefault(feature, {})[str(category)] = float(weight)
+            else:
+                numeric[str(name)] = float(weight)
+
+        return cls(
+            {
+                # tolist() keeps int labels as ints and str labels as str.
+                "classes": estimator.classes_.tolist(),
+                "intercept": float(estimator.intercept_[0]),
+                "categorical": categorical,
+                "numeric": numeric,
+            }
+        )
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.table, f, indent=2)
+
+    def decision_function(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Returns the log-odds of the positive class for an engineered frame.
+        """
+        logits = np.full(len(df), self.intercept)
+        for feature, (categories, weights) in self.categorical.items():
+            column = df[feature]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                # Translate the column's categories once, then index by code.
+                translate = np.append(
+                    categories.get_indexer(column.cat.categories.astype(str)), -1
+                )
+                codes = translate[column.cat.codes.to_numpy()]
+            else:
+                codes = categories.get_indexer(column.astype(str))
+                codes[column.isna().to_numpy()] = -1
+            logits += weights[codes]
+        logits += df[self.numeric_features].to_numpy(dtype=float) @ self.numeric_weights
+        return logits
+
+    def predict_proba(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Returns the positive-class probability for an engineered frame.
+        """
+        return 1 / (1 + np.exp(-self.decision_function(df)))
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        return self.classes[(self.decision_function(df) > 0).astype(int)]
+
+    def check_parity(self, model, preprocessor, sample: pd.DataFrame, atol=1e-6):
+        """
+        Raises ValueError unless the compiled scorer reproduces the model's
+        probabilities and labels on a sample of raw passengers.
+        """
+        engineered = preprocessor.engineer_features(sample)
+        processed = preprocessor.transform(sample)
+        expected = model.predict_proba(processed)[:, 1]
+        actual = self.predict_proba(engineered)
+        if not np.allclose(actual, expected, rtol=0, atol=atol):
+            worst = float(np.max(np.abs(actual - expected)))
+            raise ValueError(f"Compiled scorer deviates from model by {worst:.3g}")
+        # Compared as Python values, so "1" and 1 count as a disagreement.
+        labels = self.predict(engineered).tolist()
+        if labels != np.asarray(model.predict(processed)).tolist():
+            raise ValueError("Compiled scorer labels disagree with model")
+
+
+if __name__ == "__main__":
+    import joblib
+
+    from preprocessor import TitanicPreprocessor
+
+    models_dir = (
+        sys.argv[1]
+        if len(sys.argv) > 1
+        else os.path.join(os.path.dirname(__file__), "..", "..", "models")
+    )
+    preprocessor = TitanicPreprocessor(models_path=models_dir)
+    model = joblib.load(os.path.join(models_dir, "best_model.joblib"))
+    output_path = os.path.join(models_dir, "linear_weights.json")
+    scorer = LinearScorer.from_model(model, preprocessor)
+    scorer.check_parity(model, preprocessor, parity_sample())
+    scorer.save(output_path)
+    print(f"Weights table written to {output_path}")
@@ -0,0 +1,290 @@
+"""
+Load generator and latency SLO report for the prediction API.
+
+By default this builds stand-in model artifacts in a temporary directory,
+starts the API on localhost and drives it; pass --url to target a running
+server instead. Run from src/api:
+    python loadtest.py --concurrency 16 --duration 30 --report report.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+from synthetic import build_stand_in_artifacts, synthetic_passengers
+
+API_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Serves main:app the same way as --in-process: main configures DEBUG
+# logging, which would dominate the timings, so both modes quieten it.
+SERVER_SCRIPT = """
+import logging, sys
+import uvicorn
+from main import app
+logging.getLogger().setLevel(logging.WARNING)
+uvicorn.run(app, host="127.0.0.1", port=int(sys.argv[1]), log_level="warning")
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_up(url: str, timeout: float = 60.0, process=None, stderr=None):
+    """
+    Polls url until it answers, failing fast with the server's stderr if
+    the subprocess exits during startup.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            stderr.seek(0)
+            raise RuntimeError(
+                f"API exited with code {process.returncode} during startup:\n"
+                + stderr.read().decode(errors="replace")
+            )
+        try:
+            if requests.get(url, timeout=1).ok:
+                return
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"API did not come up at {url} within {timeout}s")
+
+
+def start_local_server(models_dir: str, in_process: bool):
+    """
+    Starts the API on a free localhost port and returns (base_url, stop).
+    A subprocess keeps the server off the load generator's GIL; in-process
+    runs uvicorn on a thread, which is handier for quick smoke checks.
+    """
+    os.environ["TITANIC_MODELS_DIR"] = models_dir
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = stderr = None
+
+    if in_process:
+        import uvicorn
+
+        from main import app
+
+        logging.getLogger().setLevel(logging.WARNING)
+
+        server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+        )
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+
+        def stop():
+            server.should_exit = True
+            thread.join()
+
+    else:
+        # A file rather than a pipe, so a chatty server can never block on it.
+        stderr = tempfile.TemporaryFile()
+        process = subprocess.Popen(
+            [sys.executable, "-c", SERVER_SCRIPT, str(port)],
+            cwd=API_DIR,
+            env={**os.environ, "TITANIC_MODELS_DIR": models_dir},
+            stdout=subprocess.DEVNULL,
+            stderr=stderr,
+        )
+
+        def stop():
+            process.terminate()
+            process.wait()
+            stderr.close()
+
+    try:
+        _wait_until_up(base_url + "/", process=process, stderr=stderr)
+    except Exception:
+        stop()
+        raise
+    return base_url, stop
+
+
+def _scenarios(passengers: list[dict], batch_size: int) -> dict:
+    """
+    Maps endpoint names to (path, payload builder, rows per call).
+    Payload builders take the call counter so every worker cycles the pool.
+    """
+    n = len(passengers)
+
+    def batch(i):
+        start = (i * batch_size) % n
+        return [passengers[(start + j) % n] for j in range(batch_size)]
+
+    return {
+        "predict": ("/predict", lambda i: passengers[i % n], 1),
+        "predict_batch": ("/predict/batch", batch, batch_size),
+        "explain": ("/explain", lambda i: passengers[i % n], 1),
+        "explain_batch": ("/explain/batch", batch, batch_size),
+        "sweep": (
+            "/predict/sweep",
+            lambda i: {
+                "passenger": passengers[i % n],
+                "ranges": [
+                    {"feature": "age", "start": 1, "stop": 80, "steps": 20},
+                    {"feature": "fare", "start": 5, "stop": 200, "steps": 20},
+                ],
+            },
+            400,
+        ),
+    }
+
+
+def run_scenario(
+    base_url: str,
+    path: str,
+    build_payload,
+    rows_per_call: int,
+    concurrency: int,
+    duration: float,
+) -> dict:
+    """
+    Drives one endpoint from `concurrency` workers for `duration` seconds,
+    each with its own keep-alive session, and summarizes the latencies.
+    """
+    deadline = time.monotonic() + duration
+    counter = iter(range(sys.maxsize))
+    counter_lock = threading.Lock()
+
+    def worker():
+        latencies, errors = [], 0
+        with requests.Session() as session:
+            while time.monotonic() < deadline:
+                with counter_lock:
+                    i = next(counter)
+                payload = build_payload(i)
+                start = time.perf_counter()
+                try:
+                    response = session.post(base_url + path, json=payload, timeout=30)
+                    ok = response.status_code == 200
+                except requests.exceptions.RequestException:
+                    ok = False
+                latencies.append(time.perf_counter() - start)
+                errors += not ok
+        return latencies, errors
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: worker(), range(concurrency)))
+    elapsed = time.monotonic() - started
+
+    latencies_ms = np.concatenate([r[0] for r in results]) * 1000
+    errors = sum(r[1] for r in results)
+    calls = len(latencies_ms)
+    p50, p95, p99 = (
+        np.percentile(latencies_ms, [50, 95, 99]) if calls else [float("nan")] * 3
+    )
+    return {
+        "path": path,
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "requests": calls,
+        "errors": errors,
+        "error_rate": errors / calls if calls else 0.0,
+        "throughput_rps": calls / elapsed,
+        "rows_per_s": (calls - errors) * rows_per_call / elapsed,
+        "latency_ms": {
+            "mean": float(latencies_ms.mean()) if calls else float("nan"),
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "max": float(latencies_ms.max()) if calls else float("nan"),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="Base URL of a running API to target")
+    parser.add_argument("--models-dir", help="Artifacts to serve; stand-ins if unset")
+    parser.add_argument("--in-process", action="store_true")
+    parser.add_argument(
+        "--endpoints",
+        default="predict,predict_batch",
+        help="Comma-separated: predict, predict_batch, explain, explain_batch, sweep",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds each")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--passengers", type=int, default=5000)
+    parser.add_argument("--slo-p99-ms", type=float, default=100.0)
+    parser.add_argument("--slo-error-rate", type=float, default=0.001)
+    parser.add_argument("--report", default="loadtest_report.json")
+    args = parser.parse_args()
+
+    # The preprocessor configures DEBUG logging on import; keep urllib3's
+    # per-request lines out of the load generator as well.
+    logging.getLogger().setLevel(logging.WARNING)
+
+    stop = None
+    with tempfile.TemporaryDirectory() as stand_in_dir:
+        base_url = args.url
+        if base_url is None:
+            models_dir = args.models_dir
+            if models_dir is None:
+                build_stand_in_artifacts(stand_in_dir)
+                models_dir = stand_in_dir
+            base_url, stop = start_local_server(models_dir, args.in_process)
+
+        try:
+            passengers = json.loads(
+                synthetic_passengers(args.passengers).to_json(orient="records")
+            )
+            scenarios = _scenarios(passengers, args.batch_size)
+            results = {}
+            for name in args.endpoints.split(","):
+                path, build_payload, rows_per_call = scenarios[name.strip()]
+                result = run_scenario(
+                    base_url,
+                    path,
+                    build_payload,
+                    rows_per_call,
+                    args.concurrency,
+                    args.duration,
+                )
+                result["slo_met"] = bool(
+                    result["latency_ms"]["p99"] <= args.slo_p99_ms
+                    and result["error_rate"] <= args.slo_error_rate
+                )
+                results[name.strip()] = result
+                latency = result["latency_ms"]
+                print(
+                    f"{name:<14} rps={result['throughput_rps']:8.1f} "
+                    f"p50={latency['p50']:7.2f}ms p95={latency['p95']:7.2f}ms "
+                    f"p99={latency['p99']:7.2f}ms errors={result['error_rate']:.2%} "
+                    f"slo={'ok' if result['slo_met'] else 'MISSED'}"
+                )
+        finally:
+            if stop is not None:
+                stop()
+
+    report = {
+        "target": base_url,
+        "stand_in_model": args.url is None and args.models_dir is None,
+        "slo": {"p99_ms": args.slo_p99_ms, "error_rate": args.slo_error_rate},
+        "scenarios": results,
+    }
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
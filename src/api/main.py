@@ -1,11 +1,14 @@
 import os
 import joblib
+import numpy as np
 import pandas as pd
 import traceback
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Literal, Optional
 
+from explainer import SurvivalExplainer
+from linear_export import LinearScorer, parity_sample
 from preprocessor import TitanicPreprocessor
 import logging
 
@@ -14,8 +17,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-MODELS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "models")
+MODELS_DIR = os.environ.get(
+    "TITANIC_MODELS_DIR",
+    os.path.join(os.path.dirname(__file__), "..", "..", "models"),
+)
 MODEL_PATH = os.path.join(MODELS_DIR, "best_model.joblib")
+BACKGROUND_PATH = os.path.join(MODELS_DIR, "shap_background.joblib")
+LINEAR_WEIGHTS_PATH = os.path.join(MODELS_DIR, "linear_weights.json")
 
 if not os.path.exists(MODEL_PATH):
     raise FileNotFoundError(f"Model file not found at {MODEL_PATH}")
@@ -26,6 +34,23 @@ try:
 except Exception as e:
     raise RuntimeError(f"Failed to load model or preprocessor: {e}")
 
+background = joblib.load(BACKGROUND_PATH) if os.path.exists(BACKGROUND_PATH) else None
+
+# Linear models are scored from a compiled weights table, but only once it
+# has been checked against sklearn on fixed edge cases and the background.
+linear_scorer = None
+if hasattr(getattr(model, "model", model), "coef_"):
+    try:
+        if os.path.exists(LINEAR_WEIGHTS_PATH):
+            linear_scorer = LinearScorer.load(LINEAR_WEIGHTS_PATH)
+        else:
+            linear_scorer = LinearScorer.from_model(model, preprocessor)
+        linear_scorer.check_parity(model, preprocessor, parity_sample(background))
+        logger.info("Scoring with the compiled linear weights table")
+    except Exception as e:
+        logger.warning(f"Compiled linear scorer is disabled: {e}")
+        linear_scorer = None
+
 app = FastAPI(
     title="Titanic Survival Prediction API",
     description="An API to predict passenger survival on the Titanic.",
@@ -57,6 +82,140 @@ class Passenger(BaseModel):
     )
 
 
+# The preprocessor's family_size bins stop at 20; larger families get no bin.
+MAX_FAMILY_SIZE = 20
+
+# Sweepable feature -> (minimum, maximum, integer-valued).
+SWEEP_LIMITS = {
+    "age": (0, 90, False),
+    "fare": (0, None, False),
+    "pclass": (1, 3, True),
+    "sibsp": (0, MAX_FAMILY_SIZE - 1, True),
+    "parch": (0, MAX_FAMILY_SIZE - 1, True),
+    "family_size": (1, MAX_FAMILY_SIZE, True),
+}
+
+
+class FeatureRange(BaseModel):
+    """A feature to vary, given either as explicit values or start/stop/steps."""
+
+    feature: Literal["age", "fare", "pclass", "sibsp", "parch", "family_size"]
+    values: Optional[list[float]] = Field(
+        None, min_length=1, max_length=200, description="Explicit values to try"
+    )
+    start: Optional[float] = Field(None, description="First value of the range")
+    stop: Optional[float] = Field(None, description="Last value of the range")
+    steps: int = Field(10, ge=2, le=200, description="Number of evenly spaced values")
+
+    @model_validator(mode="after")
+    def check_range(self):
+        has_bounds = self.start is not None or self.stop is not None
+        if self.values is not None and has_bounds:
+            raise ValueError("Provide either values or start and stop, not both")
+        if self.values is None and (self.start is None or self.stop is None):
+            raise ValueError("Provide either values or both start and stop")
+        low, high, _ = SWEEP_LIMITS[self.feature]
+        grid = self.grid()
+        if grid.min() < low or (high is not None and grid.max() > high):
+            raise ValueError(f"{self.feature} must lie within [{low}, {high}]")
+        return self
+
+    def grid(self) -> np.ndarray:
+        if self.values is not None:
+            grid = np.asarray(self.values, dtype=float)
+        else:
+            grid = np.linspace(self.start, self.stop, self.steps)
+        if SWEEP_LIMITS[self.feature][2]:
+            grid = np.unique(np.round(grid)).astype(int)
+        return grid
+
+
+class SweepRequest(BaseModel):
+    """A base passenger and one or two features to sweep over."""
+
+    passenger: Passenger
+    ranges: list[FeatureRange] = Field(..., min_length=1, max_length=2)
+
+    @model_validator(mode="after")
+    def check_features(self):
+        features = [r.feature for r in self.ranges]
+        if len(set(features)) != len(features):
+            raise ValueError("Each feature can only be swept once")
+        if "family_size" in features and {"sibsp", "parch"} & set(features):
+            raise ValueError("family_size cannot be swept with sibsp or parch")
+        if {"sibsp", "parch"} & set(features):
+            largest = {r.feature: int(r.grid().max()) for r in self.ranges}
+            family_size = (
+                largest.get("sibsp", self.passenger.sibsp)
+                + largest.get("parch", self.passenger.parch)
+                + 1
+            )
+            if family_size > MAX_FAMILY_SIZE:
+                raise ValueError(
+                    f"sibsp + parch + 1 reaches {family_size}; "
+                    f"family_size must not exceed {MAX_FAMILY_SIZE}"
+                )
+        return self
+
+
+def score_frame(input_df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns predicted labels and survival probabilities for raw passengers,
+    using the compiled linear scorer when one passed its parity check.
+    """
+    if linear_scorer is not None:
+        engineered_df = preprocessor.engineer_features(input_df)
+        return (
+            linear_scorer.predict(engineered_df),
+            linear_scorer.predict_proba(engineered_df),
+        )
+    processed_df = preprocessor.transform(input_df)
+    return model.predict(processed_df), model.predict_proba(processed_df)[:, 1]
+
+
+def predict_frame(input_df: pd.DataFrame) -> list[dict]:
+    """
+    Runs preprocessing and model inference on a frame of raw passengers.
+    Shared by the JSON endpoints and the binary transport.
+    """
+    return _format_predictions(*score_frame(input_df))
+
+
+def predict_processed(processed_df: pd.DataFrame) -> list[dict]:
+    """
+    Runs model inference on an already preprocessed frame.
+    """
+    return _format_predictions(
+        model.predict(processed_df), model.predict_proba(processed_df)[:, 1]
+    )
+
+
+def _format_predictions(predictions, survival_probabilities) -> list[dict]:
+    logger.debug(predictions)
+    logger.debug(survival_probabilities)
+
+    # Models trained on integer labels predict 1 rather than "1".
+    survived = [str(prediction) == "1" for prediction in predictions]
+    return [
+        {
+            "prediction": "Survived" if is_survivor else "Did not survive",
+            "survived": is_survivor,
+            "survival_probability": float(probability),
+        }
+        for is_survivor, probability in zip(survived, survival_probabilities)
+    ]
+
+
+# Explanations are built once at startup so /predict never pays for them.
+try:
+    explainer = SurvivalExplainer(
+        model, preprocessor, predict_fn=predict_processed, background=background
+    )
+except Exception as e:
+    logger.warning(f"Explanations are disabled: {e}")
+    explainer = None
+
+
 @app.get("/", tags=["General"])
 def read_root():
     """A root endpoint to check if the API is running."""
@@ -74,21 +233,103 @@ def predict_survival(passenger: Passenger):
     """
     try:
         input_df = pd.DataFrame([passenger.model_dump()])
-        processed_df = preprocessor.transform(input_df)
-        prediction = model.predict(processed_df)[0]
-        probability = model.predict_proba(processed_df)[0]
-        survival_probability = probability[1]
-
-        logger.debug(model.predict(processed_df))
-        logger.debug(model.predict_proba(processed_df))
-
-        return {
-            "prediction": "Survived" if prediction == "1" else "Did not survive",
-            "survived": bool(prediction == "1"),
-            "survival_probability": float(survival_probability),
-        }
+        return predict_frame(input_df)[0]
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(
             status_code=500, detail=f"An error occurred during prediction: {str(e)}"
         )
+
+
+@app.post("/predict/batch", tags=["Prediction"])
+def predict_survival_batch(passengers: list[Passenger]):
+    """
+    Predicts survival for a list of passengers in a single model call.
+
+    - **Receives**: A JSON array of passenger objects.
+    - **Returns**: A JSON array of predictions, in the same order.
+    """
+    if not passengers:
+        return []
+    try:
+        input_df = pd.DataFrame([passenger.model_dump() for passenger in passengers])
+        return predict_frame(input_df)
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(
+            status_code=500, detail=f"An error occurred during prediction: {str(e)}"
+        )
+
+
+@app.post("/predict/sweep", tags=["Prediction"])
+def predict_survival_sweep(request: SweepRequest):
+    """
+    Computes the survival probability surface over one or two features.
+
+    - **Receives**: A base passenger and the feature ranges to vary.
+    - **Performs**: Builds the full grid and scores it in a single batch.
+    - **Returns**: The grid values per feature and a nested list of
+      probabilities indexed like the ranges.
+    """
+    axes = [r.grid() for r in request.ranges]
+    mesh = np.meshgrid(*axes, indexing="ij")
+    size = mesh[0].size
+
+    base_df = pd.DataFrame([request.passenger.model_dump()])
+    input_df = base_df.iloc[np.zeros(size, dtype=int)].reset_index(drop=True)
+    for r, values in zip(request.ranges, mesh):
+        if r.feature == "family_size":
+            # Family size is sibsp + parch + 1; carry it entirely in sibsp.
+            input_df["sibsp"] = values.ravel() - 1
+            input_df["parch"] = 0
+        else:
+            input_df[r.feature] = values.ravel()
+
+    try:
+        _, probabilities = score_frame(input_df)
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(
+            status_code=500, detail=f"An error occurred during prediction: {str(e)}"
+        )
+
+    return {
+        "features": [r.feature for r in request.ranges],
+        "values": [values.tolist() for values in axes],
+        "survival_probability": probabilities.reshape(mesh[0].shape).tolist(),
+    }
+
+
+def _explain(passengers: list[Passenger]) -> list[dict]:
+    if explainer is None:
+        raise HTTPException(status_code=503, detail="Explanations are not available")
+    if not passengers:
+        return []
+    try:
+        return explainer.explain([passenger.model_dump() for passenger in passengers])
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(
+            status_code=500, detail=f"An error occurred during explanation: {str(e)}"
+        )
+
+
+@app.post("/explain", tags=["Explanation"])
+def explain_survival(passenger: Passenger):
+    """
+    Explains the survival prediction for a single passenger.
+
+    - **Receives**: A JSON object with passenger details.
+    - **Performs**: Preprocessing, inference and SHAP attribution.
+    - **Returns**: The prediction plus per-feature attributions, keyed by the
+      engineered features (title, has_cabin, family_size, fare_per_person, ...).
+    """
+    return _explain([passenger])[0]
+
+
+@app.post("/explain/batch", tags=["Explanation"])
+def explain_survival_batch(passengers: list[Passenger]):
+    """
+    Explains survival predictions for a list of passengers in one call.
+    """
+    return _explain(passengers)
@@ -1,13 +1,57 @@
+import numpy as np
 import pandas as pd
 import joblib
 import os
 import logging
+from pandas.api.types import CategoricalDtype
+from sklearn.preprocessing import FunctionTransformer
 
 logging.basicConfig(
     level=logging.DEBUG,
 )
 logger = logging.getLogger(__name__)
 
+CABIN_GROUPS = {
+    "A": "ABC",
+    "B": "ABC",
+    "C": "ABC",
+    "T": "ABC",
+    "D": "DEFG",
+    "E": "DEFG",
+    "F": "DEFG",
+    "G": "DEFG",
+}
+TITLE_GROUPS = {
+    "Don": "Mr",
+    "Dona": "Mrs",
+    "Mlle": "Ms",
+    "Mme": "Mrs",
+    "Miss": "Ms",
+    **{
+        title: "Rare"
+        for title in [
+            "Dr",
+            "Jonkheer",
+            "Rev",
+            "Sir",
+            "Lady",
+            "Col",
+            "Major",
+            "Countess",
+            "Capt",
+            "Master",
+        ]
+    },
+}
+
+
+def _is_passthrough(encoder) -> bool:
+    # Once fitted, ColumnTransformer stores "passthrough" (the remainder
+    # included) as a FunctionTransformer without a func, i.e. the identity.
+    if isinstance(encoder, FunctionTransformer):
+        return encoder.func is None
+    return isinstance(encoder, str) and encoder in ("passthrough", "drop")
+
 
 class TitanicPreprocessor:
     """
@@ -31,12 +75,27 @@ class TitanicPreprocessor:
         self.transformer = joblib.load(
             os.path.join(models_path, "data_transformer.joblib")
         )
+        self.schema = self._build_schema()
+        self._ohe_layout = self._build_ohe_layout()
+        if self._ohe_layout is None:
+            logger.info("One-hot encoding with transformer.transform")
+        else:
+            logger.info("One-hot encoding from categorical codes")
 
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Applies the full preprocessing pipeline.
         """
-        df_copy = df.copy()
+        df_copy = self.engineer_features(df)
+        df_copy = self._apply_ohe(df_copy, self.transformer)
+        return df_copy
+
+    def engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Applies every step except the final one-hot encoding, i.e. produces
+        the frame the data transformer is fitted on.
+        """
+        df_copy = self._apply_schema(df)
         df_copy = self._remove_home_dest(df_copy)
         df_copy = self._apply_age_feature(df_copy, self.age_lookup)
         df_copy = self._apply_cabin_feature(df_copy)
@@ -45,12 +104,126 @@ class TitanicPreprocessor:
         df_copy = self._apply_fare_feature(
             df_copy, self.ticket_counts, self.fare_lookup
         )
-        df_copy = self._apply_embarked_feature(df_copy, self.embarked_mode)
         df_copy = self._apply_sex_feature(df_copy)
-        logger.debug(df_copy.to_dict())
-        df_copy = self._apply_ohe(df_copy, self.transformer)
+        logger.debug(df_copy.head().to_dict())
+        return df_copy
+
+    def encoded_categories(self) -> dict:
+        """
+        Maps each one-hot column produced by the fitted transformer to its
+        (engineered feature, category) pair, e.g. "title_Mr" -> ("title", "Mr").
+        """
+        encoded = {}
+        for _, encoder, columns in self.transformer.transformers_:
+            if not hasattr(encoder, "categories_"):
+                continue
+            for column, categories in zip(columns, encoder.categories_):
+                for category in categories:
+                    encoded[f"{column}_{category}"] = (column, category)
+        return encoded
+
+    def encoded_feature_sources(self) -> dict:
+        """
+        Maps each column produced by the fitted transformer back to the
+        engineered feature it came from, e.g. "title_Mr" -> "title".
+        Passthrough columns map to themselves.
+        """
+        encoded = self.encoded_categories()
+        return {
+            name: encoded[name][0] if name in encoded else name
+            for name in self.transformer.get_feature_names_out()
+        }
+
+    def _build_schema(self) -> dict:
+        """
+        Fixed categorical dtypes for sex and every one-hot encoded feature,
+        taken from the fitted transformer. Without a fitted transformer (e.g.
+        while fitting it) encoded features get dtypes inferred per batch.
+        """
+        schema = {"sex": CategoricalDtype(["female", "male"])}
+        for _, encoder, columns in getattr(self.transformer, "transformers_", []):
+            if not hasattr(encoder, "categories_"):
+                continue
+            for column, categories in zip(columns, encoder.categories_):
+                schema[column] = CategoricalDtype(
+                    [category for category in categories if not pd.isna(category)]
+                )
+        return schema
+
+    def _build_ohe_layout(self):
+        """
+        Describes the transformer's output as (column, feature, code) triples
+        so one-hot columns can be built straight from categorical codes.
+        Returns None when the transformer does more than one-hot encoding
+        and passthrough, in which case transformer.transform is used.
+        """
+        if not hasattr(self.transformer, "transformers_"):
+            return None
+        for _, encoder, _ in self.transformer.transformers_:
+            if hasattr(encoder, "categories_"):
+                # Unknown codes become all-zero rows, which is only what the
+                # encoder itself does when it ignores unknown categories.
+                if getattr(encoder, "handle_unknown", None) != "ignore":
+                    return None
+            elif not _is_passthrough(encoder):
+                return None
+
+        encoded = self.encoded_categories()
+        layout = []
+        for name in self.transformer.get_feature_names_out():
+            if name in encoded:
+                feature, category = encoded[name]
+                if pd.isna(category):
+                    return None
+                code = self.schema[feature].categories.get_loc(category)
+                layout.append((name, feature, code))
+            elif name in self.transformer.feature_names_in_:
+                layout.append((name, None, None))
+            else:
+                return None
+        return layout
+
+    def _apply_schema(self, df):
+        """
+        Casts the fixed-vocabulary raw fields to their categorical dtypes at
+        ingest, so later steps work on integer codes instead of strings.
+        """
+        df_copy = df.copy()
+        # Missing ports are filled before the cast, so only ports outside the
+        # vocabulary become NaN and encode as an all-zero one-hot row.
+        if "embarked" in df_copy:
+            df_copy["embarked"] = df_copy["embarked"].fillna(self.embarked_mode)
+        for column in ["sex", "embarked"]:
+            if column in df_copy and column in self.schema:
+                df_copy[column] = df_copy[column].astype(self.schema[column])
         return df_copy
 
+    def _recode(self, values, mapping, feature):
+        """
+        Applies `mapping` once per distinct value rather than once per row and
+        returns a categorical with the schema dtype of `feature`.
+        """
+        raw = values.astype("category")
+        targets = pd.Index([mapping(value) for value in raw.cat.categories])
+        dtype = self.schema.get(feature)
+        if dtype is None:
+            dtype = CategoricalDtype(targets.dropna().unique())
+        # The trailing -1 keeps missing values (code -1) missing.
+        lookup = np.append(dtype.categories.get_indexer(targets), -1)
+        codes = lookup[raw.cat.codes.to_numpy()]
+        return pd.Series(
+            pd.Categorical.from_codes(codes, dtype=dtype),
+            index=values.index,
+            name=values.name,
+        )
+
+    def _has_schema_dtype(self, values) -> bool:
+        # Unordered CategoricalDtypes compare equal regardless of category
+        # order, but the codes only line up if the order matches too.
+        if not isinstance(values.dtype, CategoricalDtype):
+            return False
+        return values.cat.categories.equals(self.schema[values.name].categories)
+
     def _remove_home_dest(self, df):
         df_copy = df.copy()
         # return df_copy.drop("home.dest", axis=1)
@@ -58,42 +231,19 @@ class TitanicPreprocessor:
 
     def _apply_cabin_feature(self, df):
         df_copy = df.copy()
-        df_copy["cabin"] = df_copy["cabin"].fillna("M")
-        df_copy["cabin"] = df_copy["cabin"].str[0]
-        df_copy.loc[df_copy["cabin"] == "T", "cabin"] = "A"
-        df_copy["cabin"] = (
-            df_copy["cabin"]
-            .replace(["A", "B", "C"], "ABC")
-            .replace(["D", "E", "F", "G"], "DEFG")
+        df_copy["cabin"] = self._recode(
+            df_copy["cabin"].fillna("M"),
+            lambda cabin: CABIN_GROUPS.get(cabin[:1], cabin[:1]),
+            "cabin",
         )
         df_copy["has_cabin"] = (df_copy["cabin"] != "M") * 1
         return df_copy
 
     def _apply_name_feature(self, df):
         df_temp = df.copy()
-        df_temp["title"] = df_temp["name"].str.extract(r" ([A-Za-z]+)\.", expand=False)
-        df_temp["title"] = (
-            df_temp["title"]
-            .replace("Don", "Mr")
-            .replace("Dona", "Mrs")
-            .replace("Mlle", "Ms")
-            .replace("Mme", "Mrs")
-            .replace("Miss", "Ms")
-        )
-        df_temp["title"] = df_temp["title"].replace(
-            [
-                "Dr",
-                "Jonkheer",
-                "Rev",
-                "Sir",
-                "Lady",
-                "Col",
-                "Major",
-                "Countess",
-                "Capt",
-                "Master",
-            ],
-            "Rare",
+        titles = df_temp["name"].str.extract(r" ([A-Za-z]+)\.", expand=False)
+        df_temp["title"] = self._recode(
+            titles, lambda title: TITLE_GROUPS.get(title, title), "title"
         )
         return df_temp.drop("name", axis=1)
 
@@ -120,17 +270,36 @@ class TitanicPreprocessor:
         df_temp["family_size"] = pd.cut(
             df_temp["family_size"], bins=bins, labels=labels
         )
+        if "family_size" in self.schema:
+            df_temp["family_size"] = df_temp["family_size"].astype(
+                self.schema["family_size"]
+            )
         return df_temp.drop(columns=["parch", "sibsp"])
 
-    def _apply_embarked_feature(self, df, mode):
-        df_copy = df.copy()
-        df_copy["embarked"] = df_copy["embarked"].fillna(mode)
-        return df_copy
-
     def _apply_sex_feature(self, df):
         df_copy = df.copy()
-        df_copy["sex"] = df_copy["sex"].map({"female": 0, "male": 1})
+        # Codes of the fixed ["female", "male"] dtype are the 0/1 encoding.
+        codes = df_copy["sex"].astype(self.schema["sex"]).cat.codes
+        df_copy["sex"] = codes.where(codes >= 0) if (codes < 0).any() else codes
         return df_copy
 
     def _apply_ohe(self, df, transformer):
-        return transformer.transform(df)
+        if self._ohe_layout is None or not all(
+            self._has_schema_dtype(df[feature])
+            for _, feature, _ in self._ohe_layout
+            if feature is not None
+        ):
+            if self._ohe_layout is not None:
+                logger.debug("Input lacks the schema dtypes; using transformer")
+            return transformer.transform(df)
+
+        codes = {}
+        columns = {}
+        for name, feature, code in self._ohe_layout:
+            if feature is None:
+                columns[name] = df[name]
+                continue
+            if feature not in codes:
+                codes[feature] = df[feature].cat.codes.to_numpy()
+            columns[name] = (codes[feature] == code).astype(float)
+        return pd.DataFrame(columns, index=df.index)
@@ -0,0 +1,146 @@
+"""
+Synthetic passengers and stand-in model artifacts for local load testing.
+
+Build a stand-in models directory (from src/api):
+    python synthetic.py /tmp/titanic-models
+and point the API at it with TITANIC_MODELS_DIR=/tmp/titanic-models.
+"""
+
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import OneHotEncoder
+
+from preprocessor import TitanicPreprocessor
+
+SURNAMES = ["Olsen", "Braund", "Cumings", "Heikkinen", "Futrelle", "Allen", "Moran"]
+FIRST_NAMES = ["Karl", "Owen", "John", "Laina", "Lily", "William", "Anna", "Elin"]
+
+
+def synthetic_passengers(n: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Draws passengers whose marginals roughly follow the training data:
+    mostly third class and male, long-tailed fares, few recorded cabins.
+
+    :param n: Number of passengers.
+    :param seed: Seed for the random generator.
+    :return: A dataframe with the same columns as the API's Passenger model.
+    """
+    rng = np.random.default_rng(seed)
+    pclass = rng.choice([1, 2, 3], size=n, p=[0.24, 0.21, 0.55])
+    sex = rng.choice(["male", "female"], size=n, p=[0.64, 0.36])
+    age = np.clip(rng.normal(30, 14, size=n), 0.5, 80).round(1)
+    age_missing = rng.random(n) < 0.2
+    sibsp = rng.choice([0, 1, 2, 3, 4], size=n, p=[0.68, 0.23, 0.04, 0.02, 0.03])
+    parch = rng.choice([0, 1, 2, 3], size=n, p=[0.76, 0.13, 0.09, 0.02])
+    base_fare = np.choose(pclass - 1, [60.0, 20.0, 8.0])
+    fare = (base_fare * rng.lognormal(0, 0.5, size=n)).round(2)
+    embarked = rng.choice(["S", "C", "Q"], size=n, p=[0.72, 0.19, 0.09])
+    has_cabin = rng.random(n) < np.choose(pclass - 1, [0.8, 0.1, 0.03])
+    cabin_deck = rng.choice(list("ABCDEFG"), size=n)
+    cabin_number = rng.integers(1, 150, size=n)
+
+    title = np.where(
+        sex == "male",
+        np.where(age < 14, "Master", "Mr"),
+        np.where((age < 18) | (rng.random(n) < 0.4), "Miss", "Mrs"),
+    )
+    name = [
+        f"{s}, {t}. {f}"
+        for s, t, f in zip(
+            rng.choice(SURNAMES, size=n), title, rng.choice(FIRST_NAMES, size=n)
+        )
+    ]
+    # Shared tickets give the fare_per_person feature something to divide by.
+    ticket = rng.integers(100000, 100000 + max(n // 2, 1), size=n).astype(str)
+
+    return pd.DataFrame(
+        {
+            "pclass": pclass,
+            "sex": sex,
+            "age": np.where(age_missing, np.nan, age),
+            "sibsp": sibsp,
+            "parch": parch,
+            "fare": fare,
+            "embarked": embarked,
+            "name": name,
+            "ticket": ticket,
+            "cabin": [
+                f"{d}{c}" if h else None
+                for d, c, h in zip(cabin_deck, cabin_number, has_cabin)
+            ],
+        }
+    )
+
+
+def synthetic_labels(df: pd.DataFrame, seed: int = 0) -> pd.Series:
+    """
+    Samples "0"/"1" survival labels that favour women, children and first class.
+    """
+    rng = np.random.default_rng(seed)
+    logit = (
+        -0.5
+        + 2.5 * (df["sex"] == "female")
+        - 0.9 * (df["pclass"] - 2)
+        - 0.02 * (df["age"].fillna(30) - 30)
+    )
+    survived = rng.random(len(df)) < 1 / (1 + np.exp(-logit))
+    return pd.Series(np.where(survived, "1", "0"), index=df.index)
+
+
+def build_stand_in_artifacts(models_path: str, n: int = 2000, seed: int = 0):
+    """
+    Fits the preprocessing artifacts and a logistic regression on synthetic
+    passengers and writes them with the same file names as models/.
+    """
+    os.makedirs(models_path, exist_ok=True)
+    X = synthetic_passengers(n, seed=seed)
+    y = synthetic_labels(X, seed=seed)
+
+    artifacts = {
+        "age_lookup": X.groupby(["pclass", "sex"])["age"].median(),
+        "ticket_counts": X["ticket"].value_counts(),
+        "fare_lookup": X.groupby(["pclass", "sex"])["fare"].median(),
+        "embarked_mode": X["embarked"].mode()[0],
+    }
+    for name, artifact in artifacts.items():
+        joblib.dump(artifact, os.path.join(models_path, f"{name}.joblib"))
+
+    transformer = ColumnTransformer(
+        transformers=[
+            (
+                "encoder",
+                OneHotEncoder(handle_unknown="ignore", sparse_output=False),
+                ["cabin", "embarked", "family_size", "title"],
+            ),
+        ],
+        remainder="passthrough",
+        verbose_feature_names_out=False,
+    )
+    transformer.set_output(transform="pandas")
+    transformer_path = os.path.join(models_path, "data_transformer.joblib")
+    joblib.dump(transformer, transformer_path)
+
+    preprocessor = TitanicPreprocessor(models_path=models_path)
+    X_processed = transformer.fit_transform(preprocessor.engineer_features(X))
+    joblib.dump(transformer, transformer_path)
+
+    model = LogisticRegression(solver="liblinear", max_iter=100_000, random_state=29)
+    model.fit(X_processed, y)
+    joblib.dump(model, os.path.join(models_path, "best_model.joblib"))
+    joblib.dump(
+        X.sample(min(100, n), random_state=seed),
+        os.path.join(models_path, "shap_background.joblib"),
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python synthetic.py <models_dir>")
+    build_stand_in_artifacts(sys.argv[1])
+    print(f"Stand-in artifacts written to {sys.argv[1]}")
@@ -4,6 +4,20 @@ import numpy as np
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.utils.validation import check_is_fitted
 
+def _as_fitted_categorical(values, dtype):
+    """
+    Casts values to the categorical dtype seen in fit. Values that were not
+    seen keep their raw value, as categories appended after the fitted ones,
+    rather than becoming NaN; known values keep their fitted codes.
+    """
+    if dtype is None:
+        # Pickles fitted before the dtype was stored keep the object column.
+        return values
+    unseen = pd.Index(values.dropna().unique()).difference(dtype.categories)
+    if len(unseen):
+        dtype = pd.CategoricalDtype(dtype.categories.append(unseen))
+    return values.astype(dtype)
+
 class FamilyBinExtractor(BaseEstimator, TransformerMixin):
     def __init__(self):
         pass
@@ -57,18 +71,28 @@ class TitleBasedAgeImputer(BaseEstimator, TransformerMixin):
         if title in ['Mme']: return 'Mrs'
         return title
 
+    def _extract_titles(self, X):
+        # Going through a categorical cleans each distinct title once
+        # instead of once per row.
+        return (
+            X[self.name_col]
+            .str.extract(r' ([A-Za-z]+)\.', expand=False)
+            .astype('category')
+            .map(self._clean_title)
+            .astype(object)
+        )
+
     def fit(self, X, y=None):
         self.feature_names_in_ = X.columns.tolist()
         X_fit = X.copy()
-        titles = (
-            X_fit[self.name_col]
-            .str.extract(r' ([A-Za-z]+)\.', expand=False)
-            .apply(self._clean_title)
-        )
+        titles = self._extract_titles(X_fit)
         counts = titles.value_counts()
         threshold = counts.get(self.title_thres, 0)
         self.rare_titles_ = counts[counts < threshold].index.tolist()
         X_fit[self.title_col] = titles.replace(self.rare_titles_, 'Rare')
+        self.title_dtype_ = pd.CategoricalDtype(
+            sorted(X_fit[self.title_col].dropna().unique())
+        )
         self.title_median_map_ = X_fit.groupby(self.title_col)[self.age_col].median().to_dict()
         self.global_median_ = X[self.age_col].median()
 
@@ -85,13 +109,14 @@ class TitleBasedAgeImputer(BaseEstimator, TransformerMixin):
         else:
             X_transformed = X.copy()
 
-        titles = (
-            X_transformed[self.name_col]
-            .str.extract(r' ([A-Za-z]+)\.', expand=False)
-            .apply(self._clean_title)
+        titles = self._extract_titles(X_transformed)
+        titles = titles.replace(self.rare_titles_, 'Rare')
+        X_transformed[self.title_col] = _as_fitted_categorical(
+            titles, getattr(self, 'title_dtype_', None)
+        )
+        impute_values = (
+            X_transformed[self.title_col].map(self.title_median_map_).astype(float)
         )
-        X_transformed[self.title_col] = titles.replace(self.rare_titles_, 'Rare')
-        impute_values = X_transformed[self.title_col].map(self.title_median_map_)
         impute_values = impute_values.fillna(self.global_median_)
         X_transformed[self.age_col] = X_transformed[self.age_col].fillna(impute_values)
 
@@ -127,6 +152,9 @@ class EmbarkedImputer(BaseEstimator, TransformerMixin):
     def fit(self, X, y=None):
         X_copy = X.copy()
         self.mode_embarked_ = X_copy['Embarked'].mode()[0]
+        self.embarked_dtype_ = pd.CategoricalDtype(
+            sorted(X_copy['Embarked'].dropna().unique())
+        )
 
         return self
 
@@ -134,6 +162,9 @@ class EmbarkedImputer(BaseEstimator, TransformerMixin):
         check_is_fitted(self, 'mode_embarked_')
         X_copy = X.copy()
         X_copy['Embarked'] = X_copy['Embarked'].fillna(self.mode_embarked_)
+        X_copy['Embarked'] = _as_fitted_categorical(
+            X_copy['Embarked'], getattr(self, 'embarked_dtype_', None)
+        )
         return X_copy
 
     def get_feature_names_out(self, input_features=None):
@@ -1,7 +1,7 @@
 import streamlit as st
 import requests
 
-API_URL = "http://127.0.0.1:8000/predict"
+import client
 
 st.set_page_config(
     page_title="Titanic Survival Predictor", page_icon="🚢", layout="centered"
@@ -93,10 +93,8 @@ if submit_button:
 
         try:
             with st.spinner("Consulting manifest..."):
-                response = requests.post(API_URL, json=payload)
-                response.raise_for_status()
+                result = client.predict(payload)
 
-            result = response.json()
             prob = result["survival_probability"]
             survived = result["survived"]
 
@@ -111,12 +109,22 @@ if submit_button:
             st.write(f"**Survival Probability:** {prob:.1%}")
             st.progress(prob)
 
+            with st.expander("What if age and fare were different?"):
+                ages = list(range(0, 91, 5))
+                fares = sorted({round(fare * factor, 2) for factor in (0.5, 1, 2, 4)})
+                grid_df = client.what_if_grid(payload, {"age": ages, "fare": fares})
+                st.line_chart(
+                    grid_df.pivot(
+                        index="age", columns="fare", values="survival_probability"
+                    )
+                )
+
             with st.expander("View Formatted Payload Sent to API"):
                 st.json(payload)
 
         except requests.exceptions.ConnectionError:
             st.error(
-                "Connection Refused: Is the FastAPI backend running at http://127.0.0.1:8000?"
+                f"Connection Refused: Is the FastAPI backend running at {client.API_BASE_URL}?"
             )
         except Exception as e:
             st.error(f"Error: {e}")
@@ -0,0 +1,85 @@
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API_BASE_URL = os.environ.get("TITANIC_API_URL", "http://127.0.0.1:8000")
+# (connect, read) timeouts in seconds.
+TIMEOUT = (3.05, 10)
+CACHE_TTL = 600
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """
+    Returns a keep-alive session shared by every Streamlit session.
+    Predictions are idempotent, so POSTs are retried on transient failures.
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["GET", "POST"],
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=20, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _post(path: str, payload):
+    response = get_session().post(f"{API_BASE_URL}{path}", json=payload, timeout=TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def predict(payload: dict) -> dict:
+    """
+    Predicts survival for a single passenger payload.
+    Identical payloads are served from the cache.
+    """
+    return _post("/predict", payload)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def predict_batch(payloads: list[dict]) -> list[dict]:
+    """
+    Predicts survival for many payloads in a single request.
+    """
+    return _post("/predict/batch", payloads)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def sweep(payload: dict, axes: dict) -> dict:
+    """
+    Asks the API for the probability surface over one or two features.
+    """
+    ranges = [
+        {"feature": name, "values": list(values)} for name, values in axes.items()
+    ]
+    return _post("/predict/sweep", {"passenger": payload, "ranges": ranges})
+
+
+def what_if_grid(payload: dict, axes: dict) -> pd.DataFrame:
+    """
+    Scores every combination of the given feature values in one sweep call;
+    the grid is built and scored server-side.
+
+    :param payload: The base passenger payload.
+    :param axes: One or two feature names to the values to try,
+        e.g. {"age": [...], "fare": [...]}.
+    :return: One row per combination with the survival probability.
+    """
+    surface = sweep(payload, axes)
+    grid_df = pd.DataFrame(
+        list(itertools.product(*surface["values"])), columns=surface["features"]
+    )
+    grid_df["survival_probability"] = np.ravel(surface["survival_probability"])
+    return grid_df